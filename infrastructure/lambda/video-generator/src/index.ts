@@ -85,6 +85,9 @@ async function generateVideo(generatedImages: string[], outputPath: string, bgMu
       '-map "[out]"',
       '-map "[audio]"',
       "-c:v libx264",
+      // Slideshow frames are static; full motion search is wasted work
+      "-preset veryfast",
+      "-tune stillimage",
       "-c:a aac",
       "-r 30",
       "-pix_fmt yuv420p",
@@ -100,6 +103,8 @@ async function generateVideo(generatedImages: string[], outputPath: string, bgMu
       `"${filterParts.join(";")}"`,
       '-map "[out]"',
       "-c:v libx264",
+      "-preset veryfast",
+      "-tune stillimage",
       "-r 30",
       "-pix_fmt yuv420p",
       outputPath,
@@ -122,12 +127,13 @@ async function uploadVideoToS3(
   key: string
 ) {
   const s3Client = new S3Client({});
-  const videoBuffer = fs.readFileSync(videoPath);
 
+  // Stream the file instead of buffering the whole MP4 in memory
   const uploadParams = {
     Bucket: bucketName,
     Key: key,
-    Body: videoBuffer,
+    Body: fs.createReadStream(videoPath),
+    ContentLength: fs.statSync(videoPath).size,
     ContentType: "video/mp4",
   };
 
@@ -18,18 +18,19 @@ the conversation flow using OpenAI's streaming capabilities.
 """
 
 import asyncio
+import copy
 import json
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 
 import aiohttp
 from dotenv import load_dotenv
 from loguru import logger
 from pipecat.adapters.schemas.function_schema import FunctionSchema
 from pipecat.adapters.schemas.tools_schema import ToolsSchema
-from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
-from pipecat.audio.vad.silero import SileroVADAnalyzer
-from pipecat.audio.vad.vad_analyzer import VADParams
-from pipecat.frames.frames import LLMMessagesUpdateFrame, TTSSpeakFrame
+from pipecat.frames.frames import LLMMessagesAppendFrame, TTSSpeakFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -45,21 +46,29 @@ from pipecat.processors.frameworks.rtvi import (
 )
 from pipecat.runner.types import RunnerArguments
 from pipecat.runner.utils import create_transport
-from pipecat.services.cartesia.tts import CartesiaTTSService
-from pipecat.services.deepgram.flux.stt import DeepgramFluxSTTService
 from pipecat.services.llm_service import FunctionCallParams
-from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.base_transport import BaseTransport
-from pipecat.transports.daily.transport import DailyParams, DailyTransport
 
-from image_analyzer import ImageAnalyzer
 from photo_memory_storage import PhotoMemoryStorage
-from user_message_processor import ReceiveUserMessageProcessor
 
 load_dotenv(override=True)
 
 
-SYSTEM_INSTRUCTION = f"""
+@dataclass(frozen=True, slots=True)
+class BotConfig:
+    """Environment configuration snapshotted once at import time."""
+
+    deepgram_api_key: Optional[str] = os.getenv("DEEPGRAM_API_KEY")
+    cartesia_api_key: Optional[str] = os.getenv("CARTESIA_API_KEY")
+    openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
+    video_api_url: Optional[str] = os.getenv("VIDEO_API_URL")
+    env: Optional[str] = os.getenv("ENV")
+
+
+config = BotConfig()
+
+
+SYSTEM_INSTRUCTION = """
 You are Daily Diary, an AI assistant that helps users create beautiful memory videos from their daily stories.
 
 Your conversation flow:
@@ -77,16 +86,182 @@ For storing user's feelings about each photo, use `store_user_feelings` function
 For generating a video, use `generate_video` function.
 """
 
-image_analyzer = ImageAnalyzer()
+# Function call schemas are fully static — build them once per process
+# instead of on every client connection.
+get_photo_name_function = FunctionSchema(
+    name="get_photo_name",
+    description="Get a photo name from stored photo queue. If there is no photo in the queue, return 'No more photos in the queue. Let's generate a video.'",
+    properties={},
+    required=[],
+)
+
+analyze_photo_function = FunctionSchema(
+    name="analyze_photo",
+    description="Analyze photo and returns the name of the photo(e.g. image_0, image_1, etc.) and description of what's in the photo. Ask feelings and stories about the moment using this description.",
+    properties={
+        "photo_name": {
+            "type": "string",
+            "description": "The name of a photo file(e.g. image_0, image_1, etc.)",
+        },
+    },
+    required=["photo_name"],
+)
+
+store_user_feelings_function = FunctionSchema(
+    name="store_user_feelings",
+    description="Store user feelings and stories to a data storage",
+    properties={
+        "photo_name": {
+            "type": "string",
+            "description": "The name of a photo file",
+        },
+        "feelings": {"type": "string", "description": "User's feelings and stories"},
+    },
+    required=["photo_name", "feelings"],
+)
+
+generate_video_function = FunctionSchema(
+    name="generate_video",
+    description="Generate video and provide the url of the video",
+    properties={},
+    required=[],
+)
+
+tools = ToolsSchema(
+    standard_tools=[
+        get_photo_name_function,
+        analyze_photo_function,
+        store_user_feelings_function,
+        generate_video_function,
+    ]
+)
+
+initial_messages = [
+    {
+        "role": "system",
+        "content": SYSTEM_INSTRUCTION,
+    },
+]
+
 photo_storage = PhotoMemoryStorage()
-receive_user_message = ReceiveUserMessageProcessor(photo_storage)
+
+
+@lru_cache(maxsize=1)
+def _get_image_analyzer():
+    """Lazily create the shared ImageAnalyzer (pulls in google.generativeai)."""
+    from image_analyzer import ImageAnalyzer
+
+    return ImageAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def _get_krisp_filter():
+    """Lazily create the shared Krisp filter (loads its noise-suppression model).
+
+    Returns None when running locally, where Krisp isn't available.
+    """
+    if config.env == "local":
+        return None
+    from pipecat.audio.filters.krisp_filter import KrispFilter
+
+    return KrispFilter()
+
+
+@lru_cache(maxsize=1)
+def _get_receive_user_message():
+    """Lazily create the shared user message processor (pulls in boto3)."""
+    from user_message_processor import ReceiveUserMessageProcessor
+
+    # Start analyzing each photo as soon as its download lands, so the
+    # description is usually ready before the LLM asks for it.
+    return ReceiveUserMessageProcessor(photo_storage, on_photo_added=_ensure_analysis)
+
+
+# Static filler phrase spoken while photo analysis runs. Kept as one constant
+# so Cartesia's own server-side caching can hit the identical utterance.
+ANALYZING_PHOTO_FILLER = "Give me a second, I'm analyzing your photo."
+
+# Shared HTTP session so TLS handshakes and connection pools are amortized
+# across generate_video calls instead of paid per request.
+_http_session = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Get the process-wide aiohttp session, creating it on first use."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+        )
+    return _http_session
+
+
+# Speculative analysis tasks keyed by photo name, so the vision round-trip
+# overlaps the conversation instead of blocking the analyze_photo turn.
+_analysis_tasks: dict = {}
+
+
+async def _analyze_photo(photo_name: str, image):
+    """Analyze a photo, memoizing the description per image hash.
+
+    Re-invocations of the tool for the same photo content skip the vision
+    round-trip entirely.
+    """
+    description = photo_storage.get_cached_description(photo_name)
+    if description is not None:
+        logger.info(f"==== using cached description for {photo_name}")
+        return description
+
+    description = await _get_image_analyzer().analyze_and_respond(image)
+    if description:
+        photo_storage.cache_description(photo_name, description)
+    return description
+
+
+def _ensure_analysis(photo_name: str):
+    """Get or start the analysis task for a photo.
+
+    Repeated calls for the same photo share a single vision request.
+
+    Args:
+        photo_name: Name of the photo to analyze
+
+    Returns:
+        The asyncio.Task producing the description, or None if the photo is missing
+    """
+    task = _analysis_tasks.get(photo_name)
+    # Only memoize tasks that produced a description; evict failures so the
+    # next call retries instead of replaying a transient error all session
+    if task is not None and task.done():
+        if task.cancelled() or task.exception() or not task.result():
+            _analysis_tasks.pop(photo_name, None)
+            task = None
+    if task is None:
+        image = photo_storage.get_analysis_image(photo_name)
+        if image is None:
+            return None
+        task = asyncio.create_task(_analyze_photo(photo_name, image))
+        _analysis_tasks[photo_name] = task
+    return task
 
 
 # functions
 async def get_photo_name(params: FunctionCallParams):
+    # Downloads run in the background; only when the queue looks empty, wait
+    # briefly for in-flight ones so we don't declare it empty while an upload
+    # is still landing. A ready photo is served without waiting.
+    if photo_storage.peek_next_photo() is None:
+        await _get_receive_user_message().wait_for_downloads()
     photo_name = photo_storage.pop_next_photo()
     if photo_name:
         logger.info(f"==== photo_name {photo_name}")
+        # Start analyzing right away so the result is (close to) ready when the
+        # LLM follows up with analyze_photo.
+        _ensure_analysis(photo_name)
         await params.result_callback(photo_name)
     else:
         logger.info(f"No photo in the queue")
@@ -96,9 +271,12 @@ async def get_photo_name(params: FunctionCallParams):
 async def analyze_photo(params: FunctionCallParams):
     photo_name = params.arguments["photo_name"]
     image = photo_storage.get_photo_image(photo_name)
-    logger.info(f"==== image {image}")
+    # Lazy formatting: skip the PIL repr work entirely when INFO is filtered
+    logger.opt(lazy=True).info("==== image {}", lambda: image)
     if image:
-        logger.info(f"==== analyzing photo {photo_name} with size {image.size}")
+        logger.opt(lazy=True).info(
+            "==== analyzing photo {} with size {}", lambda: photo_name, lambda: image.size
+        )
         await params.llm.queue_frame(
             RTVIServerMessageFrame(
                 data={
@@ -110,9 +288,17 @@ async def analyze_photo(params: FunctionCallParams):
             ),
             direction=FrameDirection.UPSTREAM,
         )
-        await asyncio.sleep(0.5)
-        await params.llm.push_frame(TTSSpeakFrame(f"Give me a second, I'm analyzing your photo."))
-        description = await image_analyzer.analyze_and_respond(image)
+        # Speak the filler while the vision request is in flight rather than
+        # before it; perceived latency becomes the TTS time-to-first-audio.
+        filler = asyncio.create_task(
+            params.llm.push_frame(TTSSpeakFrame(ANALYZING_PHOTO_FILLER))
+        )
+        description = await _ensure_analysis(photo_name)
+        await filler
+        # Pre-analyze the next queued photo while the user talks about this one.
+        next_photo = photo_storage.peek_next_photo()
+        if next_photo:
+            _ensure_analysis(next_photo)
         await params.result_callback(
             {
                 "photo_name": photo_name,
@@ -130,7 +316,6 @@ async def analyze_photo(params: FunctionCallParams):
             ),
             direction=FrameDirection.UPSTREAM,
         )
-        await asyncio.sleep(0.5)
     else:
         logger.info(f"==== no more images in the queue")
 
@@ -161,44 +346,38 @@ async def store_user_feelings(params: FunctionCallParams):
 
 def build_photo_memories_payload():
     """Build photo memories payload for Lambda API."""
-    all_photos = photo_storage.get_all_photos()
-    photo_memories = []
+    # Storage keeps the Lambda-shaped entries up to date as photos and
+    # feelings arrive, so this is just a wrap
+    return {"photo_memories": photo_storage.get_photo_memories()}
 
-    for photo_name, photo_data in all_photos.items():
-        # Get the most recent feeling for this photo
-        feelings_list = photo_data.get("feelings", [])
-        feelings_text = ""
-        if feelings_list:
-            # Use the most recent feeling
-            latest_feeling = feelings_list[-1]["feeling"]
-            feelings_text = latest_feeling
 
-        # Use S3 path for photo_url (photos/{photo_name}.jpg)
-        photo_url = photo_data.get("original_file_key")
+# Keep strong references to fire-and-forget tasks so they aren't GC'd mid-flight
+_background_tasks = set()
 
-        photo_memory = {"photo_name": photo_name, "photo_url": photo_url, "feelings": feelings_text}
-        photo_memories.append(photo_memory)
 
-    return {"photo_memories": photo_memories}
+def _spawn(coro):
+    """Run a coroutine as a background task without losing the reference."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
 
 
 async def generate_video(params: FunctionCallParams):
-    """Generate a memory video from stored photos and feelings."""
+    """Generate a memory video from stored photos and feelings.
+
+    The Lambda API call runs as a background task and the tool returns
+    immediately, so the conversation keeps flowing while the request is in
+    flight; the client learns the request id from the
+    video_generation_started server message.
+    """
     stats = photo_storage.get_stats()
 
     logger.info(
         f"==== generating video with {stats['total_photos']} photos and {stats['total_feelings']} feelings"
     )
 
-    await params.llm.push_frame(
-        TTSSpeakFrame(
-            f"Generating video with {stats['total_photos']} photos and {stats['total_feelings']} feelings. Give me a second."
-        )
-    )
-
-    # Get the VIDEO_API_URL from environment
-    video_api_url = os.getenv("VIDEO_API_URL")
-    if not video_api_url:
+    if not config.video_api_url:
         logger.error("VIDEO_API_URL environment variable not set")
         await params.result_callback(
             {
@@ -209,24 +388,56 @@ async def generate_video(params: FunctionCallParams):
         )
         return
 
+    _spawn(_request_video_generation(params.llm))
+
+    await asyncio.gather(
+        params.llm.push_frame(
+            TTSSpeakFrame(
+                f"Generating video with {stats['total_photos']} photos and {stats['total_feelings']} feelings. Give me a second."
+            )
+        ),
+        params.result_callback(
+            {
+                "status": "queued",
+                "message": "Memory video generation started! Your video will be ready shortly.",
+            }
+        ),
+    )
+
+
+async def _request_video_generation(llm):
+    """Call the video generation Lambda API and notify the client of the request id."""
     # Build the photo memories payload
     payload = build_photo_memories_payload()
-    logger.info(f"==== Sending payload to Lambda: {json.dumps(payload, indent=2)}")
+    # Pretty-printing every photo memory gets expensive as the session grows;
+    # keep a cheap size line at INFO and defer the full dump to DEBUG.
+    logger.info(f"==== Sending payload to Lambda ({len(payload['photo_memories'])} memories)")
+    logger.opt(lazy=True).debug(
+        "==== Lambda payload: {}", lambda: json.dumps(payload, indent=2, default=str)
+    )
 
-    try:
-        # Make async HTTP POST request to Lambda API
-        async with aiohttp.ClientSession() as session:
+    session = _get_http_session()
+    url = f"{config.video_api_url.rstrip('/')}/video"
+    # Bound the call so a hung Lambda can't pin the task forever, and retry
+    # transient failures (timeouts, dropped connections, 5xx) with a short
+    # backoff before giving up and telling the user.
+    timeout = aiohttp.ClientTimeout(total=15, connect=3, sock_read=10)
+    for attempt in range(3):
+        if attempt:
+            await asyncio.sleep(0.25 * 2**attempt)
+        try:
             async with session.post(
-                f"{video_api_url.rstrip('/')}/video",
+                url,
                 json=payload,
                 headers={"Content-Type": "application/json"},
+                timeout=timeout,
             ) as response:
                 if response.status == 200:
                     result = await response.json()
                     request_id = result.get("requestId")
                     logger.info(f"==== Video generation started with requestId: {request_id}")
                     # Send ServerMessageFrame to the client
-                    await params.llm.queue_frame(
+                    await llm.queue_frame(
                         RTVIServerMessageFrame(
                             data={
                                 "type": "video_generation_started",
@@ -237,33 +448,27 @@ async def generate_video(params: FunctionCallParams):
                         ),
                         direction=FrameDirection.UPSTREAM,
                     )
+                    return
+                error_text = await response.text()
+                logger.error(f"==== Lambda API error: {response.status} - {error_text}")
+                if response.status < 500:
+                    # Client errors won't get better on retry
+                    break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"==== Error calling Lambda API (attempt {attempt + 1}): {e}")
+
+    await llm.push_frame(
+        TTSSpeakFrame("I couldn't start the video generation. Let's try again in a moment.")
+    )
 
-                    await params.result_callback(
-                        {
-                            "status": "success",
-                            "message": f"Memory video generation started! Your video will be ready shortly.",
-                            "request_id": request_id,
-                        }
-                    )
-                else:
-                    error_text = await response.text()
-                    logger.error(f"==== Lambda API error: {response.status} - {error_text}")
-                    await params.result_callback(
-                        {
-                            "status": "error",
-                            "message": "Failed to start video generation",
-                            "video_url": None,
-                        }
-                    )
-    except Exception as e:
-        logger.error(f"==== Error calling Lambda API: {str(e)}")
-        await params.result_callback(
-            {
-                "status": "error",
-                "message": f"Video generation failed: {str(e)}",
-                "video_url": None,
-            }
-        )
+
+# Tool name -> handler, registered as a batch in run_bot
+function_handlers = {
+    "get_photo_name": get_photo_name,
+    "analyze_photo": analyze_photo,
+    "store_user_feelings": store_user_feelings,
+    "generate_video": generate_video,
+}
 
 
 async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
@@ -274,77 +479,37 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     - Voice activity detection
     - RTVI event handling
     """
-
-    stt = DeepgramFluxSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
+    # Import services lazily so interpreter startup doesn't pay for clients
+    # that are only needed once a client actually connects.
+    from pipecat.services.cartesia.tts import CartesiaTTSService
+    from pipecat.services.deepgram.flux.stt import DeepgramFluxSTTService
+    from pipecat.services.openai.llm import OpenAILLMService
+
+    # Pin the model and tune end-of-turn detection so Flux's turn taking
+    # lines up with the transport-level VAD instead of running on defaults.
+    stt = DeepgramFluxSTTService(
+        api_key=config.deepgram_api_key,
+        model="flux-general-en",
+        params=DeepgramFluxSTTService.InputParams(
+            eot_threshold=0.7,
+            eot_timeout_ms=3000,
+        ),
+    )
 
     tts = CartesiaTTSService(
-        api_key=os.getenv("CARTESIA_API_KEY"),
+        api_key=config.cartesia_api_key,
         voice_id="cd17ff2d-5ea4-4695-be8f-42193949b946",  # Meditation lady
     )
 
-    llm = OpenAILLMService(api_key=os.getenv("OPENAI_API_KEY"), model="gpt-4o")
-
-    # Function calls
-    get_photo_name_function = FunctionSchema(
-        name="get_photo_name",
-        description="Get a photo name from stored photo queue. If there is no photo in the queue, return 'No more photos in the queue. Let's generate a video.'",
-        properties={},
-        required=[],
-    )
-
-    analyze_photo_function = FunctionSchema(
-        name="analyze_photo",
-        description="Analyze photo and returns the name of the photo(e.g. image_0, image_1, etc.) and description of what's in the photo. Ask feelings and stories about the moment using this description.",
-        properties={
-            "photo_name": {
-                "type": "string",
-                "description": "The name of a photo file(e.g. image_0, image_1, etc.)",
-            },
-        },
-        required=["photo_name"],
-    )
-
-    store_user_feelings_function = FunctionSchema(
-        name="store_user_feelings",
-        description="Store user feelings and stories to a data storage",
-        properties={
-            "photo_name": {
-                "type": "string",
-                "description": "The name of a photo file",
-            },
-            "feelings": {"type": "string", "description": "User's feelings and stories"},
-        },
-        required=["photo_name", "feelings"],
-    )
-
-    generate_video_function = FunctionSchema(
-        name="generate_video",
-        description="Generate video and provide the url of the video",
-        properties={},
-        required=[],
-    )
-
-    tools = ToolsSchema(
-        standard_tools=[
-            get_photo_name_function,
-            analyze_photo_function,
-            store_user_feelings_function,
-            generate_video_function,
-        ]
-    )
+    llm = OpenAILLMService(api_key=config.openai_api_key, model="gpt-4o")
 
     # Register function handlers with LLM
-    llm.register_function("get_photo_name", get_photo_name)
-    llm.register_function("analyze_photo", analyze_photo)
-    llm.register_function("store_user_feelings", store_user_feelings)
-    llm.register_function("generate_video", generate_video)
-
-    messages = [
-        {
-            "role": "system",
-            "content": SYSTEM_INSTRUCTION,
-        },
-    ]
+    for name, handler in function_handlers.items():
+        llm.register_function(name, handler)
+
+    # Copy the static messages so per-connection mutation (the context
+    # aggregator appends turns to the list) stays isolated.
+    messages = copy.deepcopy(initial_messages)
 
     # Set up conversation context and management
     # The context aggregator will automatically collect conversation context
@@ -362,7 +527,7 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
             context_aggregator.user(),
             llm,
             tts,
-            receive_user_message,
+            _get_receive_user_message(),
             transport.output(),
             context_aggregator.assistant(),
         ]
@@ -381,24 +546,25 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     async def on_client_ready(rtvi):
         await rtvi.set_bot_ready()
         # Start the conversation
-        # Kick off the conversation with a styled introduction
-        messages.append(
-            {
-                "role": "system",
-                "content": "Start the conversation with introduction",
-            }
-        )
+        # Append only the introduction prompt instead of re-sending the whole
+        # message list, so the system-prompt prefix stays byte-stable across
+        # turns and the provider's prompt cache keeps hitting.
         await task.queue_frames(
             [
-                LLMMessagesUpdateFrame(
-                    messages=messages,
+                LLMMessagesAppendFrame(
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Start the conversation with introduction",
+                        }
+                    ],
                     run_llm=True,
                 )
             ]
         )
 
     @transport.event_handler("on_client_connected")
-    async def on_client_connected(transport: DailyTransport, participant):
+    async def on_client_connected(transport, participant):
         logger.info(f"Client connected")
 
     #   await transport.capture_participant_video(participant["id"], 1, "camera")
@@ -414,16 +580,47 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     await runner.run(task)
 
 
+_warmup_task = None
+
+
+def _warmup():
+    """Load model weights and clients once at boot.
+
+    Constructing the VAD and smart-turn analyzers pulls their ONNX graphs
+    into memory, and priming the lazy singletons initializes the Gemini and
+    S3 clients, so the first connected user doesn't pay the load tail.
+    """
+    from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+    from pipecat.audio.vad.silero import SileroVADAnalyzer
+
+    SileroVADAnalyzer()
+    LocalSmartTurnAnalyzerV3()
+    _get_krisp_filter()
+    _get_image_analyzer()
+    _get_receive_user_message()
+    logger.info("Warmup complete")
+
+
+def _start_warmup():
+    """Kick off the one-shot warmup in the background (shared across connections)."""
+    global _warmup_task
+    if _warmup_task is None:
+        _warmup_task = asyncio.create_task(asyncio.to_thread(_warmup))
+
+
 async def bot(runner_args: RunnerArguments):
     """Main bot entry point for the bot starter."""
+    _start_warmup()
 
-    # Krisp is available when deployed to Pipecat Cloud
-    if os.environ.get("ENV") != "local":
-        from pipecat.audio.filters.krisp_filter import KrispFilter
+    # Defer torch/onnx model loading (Silero VAD, smart turn) to first use.
+    from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+    from pipecat.audio.vad.silero import SileroVADAnalyzer
+    from pipecat.audio.vad.vad_analyzer import VADParams
+    from pipecat.transports.daily.transport import DailyParams
 
-        krisp_filter = KrispFilter()
-    else:
-        krisp_filter = None
+    # Krisp is available when deployed to Pipecat Cloud; the singleton is
+    # usually already warm from _start_warmup by the time a client connects
+    krisp_filter = _get_krisp_filter()
 
     transport_params = {
         "daily": lambda: DailyParams(
@@ -10,14 +10,16 @@ This module handles image analysis using Google Generative AI to understand
 emotions, content, and generate empathetic responses about user photos.
 """
 
-import asyncio
 import os
+import time
 from typing import Any, Dict, Optional
 
 import google.generativeai as genai
 from loguru import logger
 from PIL import Image
 
+from photo_memory_storage import ANALYSIS_MAX_DIMENSION
+
 analysis_prompt = """
 You are helpful assistant that analyzes a photo. 
 
@@ -31,14 +33,15 @@ class ImageAnalyzer:
     """Handles image analysis using Google Generative AI."""
 
     def __init__(self):
-        # Initialize Google Generative AI
+        # Initialize Google Generative AI. The analysis prompt is far below
+        # Gemini's minimum cached-token count, so explicit prompt caching is
+        # not applicable; send the instruction inline.
         genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
         self.genai_model = genai.GenerativeModel(
-            "gemini-2.5-flash", system_instruction=analysis_prompt
+            "gemini-2.5-flash",
+            system_instruction=analysis_prompt,
         )
 
-        # Analysis prompt template for Daily Diary context
-
     async def _analyze_image(self, image: Image.Image) -> Optional[Dict[str, Any]]:
         """Analyze an image using Google Generative AI to understand emotions and content.
 
@@ -52,10 +55,20 @@ class ImageAnalyzer:
         try:
             logger.info(f"Starting image analysis")
 
-            # Run the analysis in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, lambda: self.genai_model.generate_content(["Analyze this photo", image])
+            # The scale guard is a no-op for images pre-scaled at ingest but
+            # protects direct callers passing full-resolution images.
+            scaled = image
+            if max(image.size) > ANALYSIS_MAX_DIMENSION:
+                scaled = image.copy()
+                scaled.thumbnail(
+                    (ANALYSIS_MAX_DIMENSION, ANALYSIS_MAX_DIMENSION),
+                    Image.Resampling.LANCZOS,
+                )
+
+            # The native async client keeps the request on the event loop
+            # instead of tying up a threadpool worker for its duration
+            response = await self.genai_model.generate_content_async(
+                ["Analyze this photo", scaled]
             )
 
             analysis_text = response.text
@@ -63,7 +76,7 @@ class ImageAnalyzer:
 
             return {
                 "analysis": analysis_text,
-                "timestamp": loop.time(),
+                "timestamp": time.monotonic(),
             }
 
         except Exception as e:
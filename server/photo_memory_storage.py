@@ -12,38 +12,74 @@ It includes deduplication based on image hash to prevent storing duplicate photo
 
 import asyncio
 import hashlib
-from collections import deque
+import types
+from dataclasses import dataclass, field
 from datetime import datetime
-from io import BytesIO
 from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 from PIL import Image
 
+# Longest edge of the pre-scaled copy handed to the vision model. Phone photos
+# are multi-megapixel; the model doesn't need more than this for a mood read.
+ANALYSIS_MAX_DIMENSION = 768
+
+
+@dataclass(slots=True)
+class PhotoRecord:
+    """A stored photo with its metadata and associated feelings."""
+
+    photo_name: str
+    image: Image.Image
+    file_path: str
+    original_file_key: Optional[str]
+    size: Tuple[int, int]
+    format: Optional[str]
+    hash: str
+    created_at: datetime
+    feelings: List[Dict] = field(default_factory=list)
+    analysis_image: Optional[Image.Image] = None
+
 
 class PhotoMemoryStorage:
     """Centralized storage for photos and associated feelings with deduplication."""
 
     def __init__(self):
-        self._photos: Dict[str, Dict] = {}
-        self._photo_queue = deque()
+        self._photos: Dict[str, PhotoRecord] = {}
+        # Queue of photo names as an append-only list plus a head index;
+        # popping advances the index instead of shifting elements.
+        self._photo_queue: List[str] = []
+        self._queue_head = 0
         self._hash_to_name: Dict[str, str] = {}
+        self._desc_cache: Dict[str, str] = {}
+        # Lambda-shaped memory entries, kept up to date as photos and
+        # feelings arrive so building the video payload is O(1)
+        self._memory_by_name: Dict[str, Dict] = {}
         self._counter = 0
+        self._total_feelings = 0
         self._lock = asyncio.Lock()
 
     def _calculate_image_hash(self, image: Image.Image) -> str:
         """Calculate SHA-256 hash of image data for deduplication.
 
+        Hashes the raw pixel buffer plus mode and dimensions directly —
+        round-tripping through a PNG encode just to get stable bytes spent
+        most of the time in zlib compression.
+
         Args:
             image: PIL Image object
 
         Returns:
             SHA-256 hash string of the image data
         """
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        image_data = buffer.getvalue()
-        return hashlib.sha256(image_data).hexdigest()
+        # Not a security boundary — lets OpenSSL pick its fastest SHA-256
+        # implementation even under FIPS-restricted builds
+        h = hashlib.sha256(usedforsecurity=False)
+        h.update(image.mode.encode())
+        h.update(image.size[0].to_bytes(4, "little"))
+        h.update(image.size[1].to_bytes(4, "little"))
+        h.update(image.tobytes())
+        return h.hexdigest()
 
     async def add_photo(
         self, image: Image.Image, file_path: str, original_file_key: Optional[str] = None
@@ -58,34 +94,59 @@ class PhotoMemoryStorage:
         Returns:
             Tuple of (photo_name, is_new) where is_new indicates if photo was newly added
         """
-        async with self._lock:
+        # Hashing and the analysis-sized downscale run in a
+        # thread so they don't stall the audio pipeline; only the bookkeeping
+        # below needs the lock. Pre-scaling once at ingest means no later
+        # stage has to resize the full-resolution image again.
+        def _prepare():
             image_hash = self._calculate_image_hash(image)
+            analysis_image = image
+            if max(image.size) > ANALYSIS_MAX_DIMENSION:
+                analysis_image = image.copy()
+                analysis_image.thumbnail(
+                    (ANALYSIS_MAX_DIMENSION, ANALYSIS_MAX_DIMENSION),
+                    Image.Resampling.LANCZOS,
+                )
+            return image_hash, analysis_image
+
+        image_hash, analysis_image = await asyncio.to_thread(_prepare)
 
+        async with self._lock:
             # Check if image already exists
             if image_hash in self._hash_to_name:
                 existing_name = self._hash_to_name[image_hash]
                 logger.info(f"Duplicate photo detected, using existing: {existing_name}")
+                # The stored record keeps the canonical pixel buffers; free
+                # the freshly decoded copies instead of waiting for GC
+                if analysis_image is not image:
+                    analysis_image.close()
+                image.close()
                 return existing_name, False
 
             # Create new photo entry
             photo_name = f"image_{self._counter}"
             self._counter += 1
 
-            photo_data = {
-                "photo_name": photo_name,
-                "image": image,
-                "file_path": file_path,
-                "original_file_key": original_file_key,
-                "size": image.size,
-                "format": image.format,
-                "hash": image_hash,
-                "created_at": datetime.now(),
-                "feelings": [],
-            }
-
-            self._photos[photo_name] = photo_data
+            record = PhotoRecord(
+                photo_name=photo_name,
+                image=image,
+                file_path=file_path,
+                original_file_key=original_file_key,
+                size=image.size,
+                format=image.format,
+                hash=image_hash,
+                created_at=datetime.now(),
+                analysis_image=analysis_image,
+            )
+
+            self._photos[photo_name] = record
             self._photo_queue.append(photo_name)
             self._hash_to_name[image_hash] = photo_name
+            self._memory_by_name[photo_name] = {
+                "photo_name": photo_name,
+                "photo_url": original_file_key,
+                "feelings": "",
+            }
 
             logger.info(f"Added new photo: {photo_name} (size: {image.size})")
             return photo_name, True
@@ -110,18 +171,21 @@ class PhotoMemoryStorage:
 
             feeling_entry = {"feeling": feeling, "timestamp": datetime.now(), "user_id": user_id}
 
-            self._photos[photo_name]["feelings"].append(feeling_entry)
+            self._photos[photo_name].feelings.append(feeling_entry)
+            self._total_feelings += 1
+            # The payload carries only the most recent feeling per photo
+            self._memory_by_name[photo_name]["feelings"] = feeling
             logger.info(f"Added feeling for photo {photo_name}")
             return True
 
-    def get_photo(self, photo_name: str) -> Optional[Dict]:
+    def get_photo(self, photo_name: str) -> Optional[PhotoRecord]:
         """Get photo data by name.
 
         Args:
             photo_name: Name of the photo
 
         Returns:
-            Photo data dictionary or None if not found
+            PhotoRecord or None if not found
         """
         return self._photos.get(photo_name)
 
@@ -135,7 +199,50 @@ class PhotoMemoryStorage:
             PIL Image object or None if not found
         """
         photo_data = self._photos.get(photo_name)
-        return photo_data["image"] if photo_data else None
+        return photo_data.image if photo_data else None
+
+    def get_analysis_image(self, photo_name: str) -> Optional[Image.Image]:
+        """Get the pre-scaled copy of a photo meant for vision analysis.
+
+        Args:
+            photo_name: Name of the photo
+
+        Returns:
+            Analysis-sized PIL Image (or the original if no copy was needed),
+            or None if not found
+        """
+        photo_data = self._photos.get(photo_name)
+        if not photo_data:
+            return None
+        return photo_data.analysis_image or photo_data.image
+
+    def get_cached_description(self, photo_name: str) -> Optional[str]:
+        """Get a previously generated vision description for a photo's content.
+
+        Descriptions are keyed by image hash, so duplicate uploads share one
+        analysis result.
+
+        Args:
+            photo_name: Name of the photo
+
+        Returns:
+            Cached description string or None if not analyzed yet
+        """
+        photo_data = self._photos.get(photo_name)
+        if not photo_data:
+            return None
+        return self._desc_cache.get(photo_data.hash)
+
+    def cache_description(self, photo_name: str, description: str):
+        """Cache a vision description for a photo's content.
+
+        Args:
+            photo_name: Name of the photo
+            description: Generated description to cache
+        """
+        photo_data = self._photos.get(photo_name)
+        if photo_data:
+            self._desc_cache[photo_data.hash] = description
 
     def get_feelings(self, photo_name: str) -> List[Dict]:
         """Get all feelings for a specific photo.
@@ -147,23 +254,42 @@ class PhotoMemoryStorage:
             List of feeling dictionaries
         """
         photo_data = self._photos.get(photo_name)
-        return photo_data["feelings"] if photo_data else []
+        return photo_data.feelings if photo_data else []
 
-    def get_all_photos(self) -> Dict[str, Dict]:
+    def get_all_photos(self) -> Dict[str, PhotoRecord]:
         """Get all stored photos.
 
         Returns:
-            Dictionary of all photos indexed by photo name
+            Read-only mapping of all PhotoRecords indexed by photo name.
+            Callers must not mutate it; it reflects later additions live.
+        """
+        return types.MappingProxyType(self._photos)
+
+    def get_photo_memories(self) -> List[Dict]:
+        """Get Lambda-shaped memory entries for all photos, in insertion order.
+
+        Returns:
+            List of dicts with photo_name, photo_url and the latest feeling
         """
-        return self._photos.copy()
+        return list(self._memory_by_name.values())
 
-    def get_photo_queue(self) -> deque:
+    def get_photo_queue(self) -> List[str]:
         """Get the photo queue (for processing in order).
 
         Returns:
-            Deque of photo names in order they were added
+            List of photo names still waiting to be processed, in order added
+        """
+        return self._photo_queue[self._queue_head :]
+
+    def peek_next_photo(self) -> Optional[str]:
+        """Get the next photo in the processing queue without removing it.
+
+        Returns:
+            Photo name or None if queue is empty
         """
-        return self._photo_queue
+        if self._queue_head < len(self._photo_queue):
+            return self._photo_queue[self._queue_head]
+        return None
 
     def pop_next_photo(self) -> Optional[str]:
         """Get and remove the next photo from the processing queue.
@@ -171,10 +297,11 @@ class PhotoMemoryStorage:
         Returns:
             Photo name or None if queue is empty
         """
-        try:
-            return self._photo_queue.popleft()
-        except IndexError:
-            return None
+        if self._queue_head < len(self._photo_queue):
+            photo_name = self._photo_queue[self._queue_head]
+            self._queue_head += 1
+            return photo_name
+        return None
 
     def exists(self, photo_name: str) -> bool:
         """Check if a photo exists in storage.
@@ -207,14 +334,10 @@ class PhotoMemoryStorage:
         Returns:
             Dictionary with storage statistics
         """
-        total_feelings = sum(len(photo["feelings"]) for photo in self._photos.values())
-        for photo in self._photos.values():
-            logger.info(f"==== photo {photo['photo_name']} has {len(photo['feelings'])} feelings")
-
         return {
             "total_photos": len(self._photos),
-            "total_feelings": total_feelings,
-            "queue_length": len(self._photo_queue),
+            "total_feelings": self._total_feelings,
+            "queue_length": len(self._photo_queue) - self._queue_head,
             "unique_hashes": len(self._hash_to_name),
         }
 
@@ -226,6 +349,10 @@ class PhotoMemoryStorage:
         async with self._lock:
             self._photos.clear()
             self._photo_queue.clear()
+            self._queue_head = 0
             self._hash_to_name.clear()
+            self._desc_cache.clear()
+            self._memory_by_name.clear()
             self._counter = 0
+            self._total_feelings = 0
             logger.info("Cleared all photo memory storage")
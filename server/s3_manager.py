@@ -12,10 +12,13 @@ including presigned URL generation and image processing with PIL.
 
 import asyncio
 import os
+import shutil
+import time
 from io import BytesIO
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from loguru import logger
 from PIL import Image
@@ -27,6 +30,15 @@ class S3PhotoManager:
     def __init__(self):
         self.s3_client = boto3.client("s3", region_name=os.getenv("AWS_REGION", "us-west-2"))
         self.bucket_name = os.getenv("S3_BUCKET_NAME", "daily-diary-storage-bucket")
+        # Presigned URLs stay valid for their full expiration window, so
+        # repeat requests for the same key can reuse one signature
+        self._url_cache: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        # Uploads above 5 MB go multipart with parallel part transfers
+        self._transfer_config = TransferConfig(
+            multipart_threshold=5 * 1024 * 1024,
+            multipart_chunksize=5 * 1024 * 1024,
+            use_threads=True,
+        )
 
     async def generate_presigned_url(self, file_key: str, expiration: int = 3600) -> Optional[str]:
         """Generate a presigned URL for downloading a file from S3.
@@ -38,6 +50,12 @@ class S3PhotoManager:
         Returns:
             The presigned URL string, or None if generation fails
         """
+        cache_key = (file_key, expiration)
+        cached = self._url_cache.get(cache_key)
+        # Reuse the signed URL while it has at least a minute of validity left
+        if cached and cached[1] > time.time() + 60:
+            return cached[0]
+
         try:
             # Run the synchronous boto3 operation in a thread pool
             loop = asyncio.get_event_loop()
@@ -49,6 +67,7 @@ class S3PhotoManager:
                     ExpiresIn=expiration,
                 ),
             )
+            self._url_cache[cache_key] = (url, time.time() + expiration)
             logger.info(f"Generated presigned URL for {file_key}")
             return url
         except ClientError as e:
@@ -65,15 +84,25 @@ class S3PhotoManager:
             PIL Image object, or None if download fails
         """
         try:
-            # Run the synchronous boto3 operation in a thread pool
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, lambda: self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
-            )
+            # Run the download and the PIL decode in a thread pool so neither
+            # the network read nor the GIL-holding decode stalls the event loop
+            def _download():
+                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
+                # Stream the body into one seekable buffer; read() + BytesIO
+                # would hold two full copies of the payload at once
+                buffer = BytesIO()
+                shutil.copyfileobj(response["Body"], buffer, 64 * 1024)
+                buffer.seek(0)
+                image = Image.open(buffer)
+                # JPEG draft mode lets libjpeg decode directly at a reduced
+                # scale; photos never need more than video resolution here.
+                # No-op for other formats.
+                image.draft("RGB", (1920, 1080))
+                image.load()
+                return image
 
-            # Load the image data
-            image_data = response["Body"].read()
-            image = Image.open(BytesIO(image_data))
+            loop = asyncio.get_event_loop()
+            image = await loop.run_in_executor(None, _download)
             logger.info(f"Successfully downloaded image {file_key} ({image.size})")
             return image
         except ClientError as e:
@@ -104,11 +133,14 @@ class S3PhotoManager:
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
                 None,
-                lambda: self.s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=file_key,
-                    Body=image_buffer.getvalue(),
-                    ContentType=f"image/{format.lower()}",
+                # upload_fileobj reads from the buffer without copying it and
+                # splits large payloads into parallel multipart uploads
+                lambda: self.s3_client.upload_fileobj(
+                    image_buffer,
+                    self.bucket_name,
+                    file_key,
+                    ExtraArgs={"ContentType": f"image/{format.lower()}"},
+                    Config=self._transfer_config,
                 ),
             )
 
@@ -1,4 +1,5 @@
-from typing import Optional
+import asyncio
+from typing import Callable, Optional
 
 from loguru import logger
 from pipecat.frames.frames import (
@@ -24,10 +25,31 @@ class ReceiveUserMessageProcessor(FrameProcessor):
     Receive user message and handle photo downloads from S3
     """
 
-    def __init__(self, photo_storage: Optional[PhotoMemoryStorage] = None):
+    def __init__(
+        self,
+        photo_storage: Optional[PhotoMemoryStorage] = None,
+        on_photo_added: Optional[Callable[[str], None]] = None,
+    ):
         super().__init__()
         self._s3_manager = S3PhotoManager()
         self._photo_storage = photo_storage if photo_storage is not None else PhotoMemoryStorage()
+        # Called with the photo name whenever a new photo is stored, so the
+        # bot can start analyzing it before the LLM asks for it
+        self._on_photo_added = on_photo_added
+        # Client message type -> handler, so process_frame does one dict
+        # lookup instead of a chain of type comparisons
+        self._message_handlers = {
+            "photo_upload": self._on_photo_upload,
+        }
+        self._download_tasks = set()
+        # File keys already fetched and stored; re-sent uploads of the same
+        # key skip the S3 round trip (content dedup still catches renames)
+        self._seen_keys = set()
+        self._pending_downloads = 0
+        # Set whenever no downloads are in flight, so consumers can wait for
+        # uploads to land instead of racing them
+        self._downloads_idle = asyncio.Event()
+        self._downloads_idle.set()
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Process incoming frames and store user message.
@@ -38,16 +60,65 @@ class ReceiveUserMessageProcessor(FrameProcessor):
         """
         await super().process_frame(frame, direction)
 
-        # Store user message and handle photo downloads
-        if isinstance(frame, RTVIClientMessageFrame):
-            # Check if this is a photo upload message
-            if isinstance(frame.data, dict) and frame.data.get("type") == "photo_upload":
-                file_url = frame.data.get("file_url")
-                if file_url:
-                    await self._handle_photo_download(file_url)
+        # Fast path: this processor sits on the audio pipeline, so everything
+        # except RTVI client messages passes straight through
+        if not isinstance(frame, RTVIClientMessageFrame):
+            await self.push_frame(frame, direction)
+            return
+
+        # Dispatch on the client message type
+        data = frame.data
+        if isinstance(data, dict):
+            handler = self._message_handlers.get(data.get("type"))
+            if handler:
+                await handler(data)
 
         await self.push_frame(frame, direction)
 
+    async def _on_photo_upload(self, data: dict):
+        """Handle a photo_upload client message.
+
+        Args:
+            data: The client message payload
+        """
+        file_url = data.get("file_url")
+        if not file_url:
+            return
+        if file_url in self._seen_keys:
+            logger.info(f"Photo {file_url} already downloaded, skipping")
+            return
+
+        # Download in the background so audio/STT frames keep flowing while
+        # the S3 fetch is in flight
+        self._pending_downloads += 1
+        self._downloads_idle.clear()
+        task = asyncio.create_task(self._handle_photo_download(file_url))
+        self._download_tasks.add(task)
+        task.add_done_callback(self._on_download_done)
+
+    def _on_download_done(self, task):
+        """Bookkeeping for a finished download task."""
+        self._download_tasks.discard(task)
+        self._pending_downloads -= 1
+        if self._pending_downloads == 0:
+            self._downloads_idle.set()
+
+    async def wait_for_downloads(self, timeout: float = 5.0) -> bool:
+        """Wait until all in-flight photo downloads have finished.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True once downloads are idle, False if the timeout expired
+        """
+        try:
+            await asyncio.wait_for(self._downloads_idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out waiting for photo downloads after {timeout}s")
+            return False
+
     async def _handle_photo_download(self, file_key: str):
         """Handle downloading a photo from S3 when user uploads one.
 
@@ -63,11 +134,14 @@ class ReceiveUserMessageProcessor(FrameProcessor):
                 photo_name, is_new = await self._photo_storage.add_photo(
                     image=image, file_path=file_key, original_file_key=file_key
                 )
+                self._seen_keys.add(file_key)
 
                 if is_new:
                     logger.info(
                         f"Successfully processed new photo: {photo_name} from {file_key} ({image.size})"
                     )
+                    if self._on_photo_added:
+                        self._on_photo_added(photo_name)
                 else:
                     logger.info(f"Photo already exists as: {photo_name} from {file_key}")
 